@@ -64,6 +64,9 @@ module tt_um_example (
 endmodule
 
 // ---------- Counter core (async reset, sync load) ----------
+// The testbench only asserts on the wrapper's I/O, so keep the core out of
+// Verilator traces to cut waveform bandwidth.
+/* verilator tracing_off */
 module prog_counter8_core (
     input  wire       clk,
     input  wire       rst_n,  // async, active-low
@@ -7,15 +7,33 @@
 module tb ();
 
   // Dump the signals to a VCD file. You can view it with gtkwave or surfer.
+  // Only record the testbench signals and the user project's ports — the
+  // test asserts on top-level I/O only, and a full-depth dump of the
+  // gate-level netlist makes the GL run dominated by VCD I/O.
+  // Verilator runs dump via cocotb's harness (dump.vcd) instead, since
+  // native $dumpvars support depends on the Verilator version.
+  // The dump defaults to tb.vcd for every run (the tt-gds-action gl_test
+  // step uploads that exact path). The parallel sim-gl make target
+  // overrides VCD_NAME so `make -j2 sim-rtl sim-gl` doesn't have two
+  // simulators clobbering one waveform file.
+`ifndef VCD_NAME
+`define VCD_NAME "tb.vcd"
+`endif
+`ifndef VERILATOR
   initial begin
-    $dumpfile("tb.vcd");
-    $dumpvars(0, tb);
+    $dumpfile(`VCD_NAME);
+    $dumpvars(1, tb, user_project);
     #1;
   end
+`endif
 
   // Wire up the inputs and outputs:
-  reg clk;
+  reg clk = 0;
   reg rst_n;
+
+  // 50 MHz clock (period 20 ns), generated here instead of from cocotb so
+  // each edge doesn't cost a VPI write from Python.
+  always #10 clk = ~clk;
   reg ena;
   reg [7:0] ui_in;
   reg [7:0] uio_in;